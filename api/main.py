@@ -1,10 +1,23 @@
 # Import FastAPI framework and our custom workflow function
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from graph import run_workflow
+from graph import run_workflow, warm_up
 from agents.state import StockState
 
+# Compile the workflow and load the sentiment lexicon before serving traffic,
+# so the first request doesn't pay for it
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up()
+    yield
+
 # Create the main FastAPI application with a title
-app = FastAPI(title="Stock Chatbot API")
+app = FastAPI(title="Stock Chatbot API", lifespan=lifespan)
+
+# Lightweight endpoint for readiness checks and the startup benchmark
+@app.get("/health")
+async def health() -> dict:
+    return {"status": "ok"}
 
 # Endpoint to get stock data for a given symbol
 @app.get("/stock/{symbol}", response_model=StockState)
@@ -1,4 +1,3 @@
-from langgraph.graph import StateGraph, END
 from agents.state import StockState  # Replace with your actual state definition
 from agents.coordinator import coordinator_node  # Replace with your actual nodes
 from agents.stock_price import stock_price_node
@@ -6,34 +5,54 @@ from agents.financial_data import financial_data_node
 from agents.sentiment import sentiment_node
 import time
 
+# Compiled workflow, built once per process on first use (see get_app)
+_app = None
+
 # Define the workflow
-graph = StateGraph(StockState)
+def build_graph():
+    # LangGraph is only imported when the graph is actually built
+    from langgraph.graph import StateGraph, END
+
+    graph = StateGraph(StockState)
+
+    # Add nodes
+    graph.add_node("coordinator_start", coordinator_node)
+    graph.add_node("stock_price_agent", stock_price_node)
+    graph.add_node("financial_data_agent", financial_data_node)
+    graph.add_node("sentiment_agent", sentiment_node)
+    graph.add_node("coordinator_check", coordinator_node)
 
-# Add nodes
-graph.add_node("coordinator_start", coordinator_node)
-graph.add_node("stock_price_agent", stock_price_node)
-graph.add_node("financial_data_agent", financial_data_node)
-graph.add_node("sentiment_agent", sentiment_node)
-graph.add_node("coordinator_check", coordinator_node)
+    # Set entry point
+    graph.set_entry_point("coordinator_start")
 
-# Set entry point
-graph.set_entry_point("coordinator_start")
+    # Define edges
+    graph.add_edge("coordinator_start", "stock_price_agent")
+    graph.add_edge("stock_price_agent", "financial_data_agent")
+    graph.add_edge("financial_data_agent", "sentiment_agent")
+    graph.add_edge("sentiment_agent", "coordinator_check")
+    graph.add_edge("coordinator_check", END)
 
-# Define edges
-graph.add_edge("coordinator_start", "stock_price_agent")
-graph.add_edge("stock_price_agent", "financial_data_agent")
-graph.add_edge("financial_data_agent", "sentiment_agent")
-graph.add_edge("sentiment_agent", "coordinator_check")
-graph.add_edge("coordinator_check", END)
+    # Compile the graph without config
+    return graph.compile(checkpointer=None, interrupt_after=None, interrupt_before=None)
 
-# Compile the graph without config
-app = graph.compile(checkpointer=None, interrupt_after=None, interrupt_before=None)
+# Return the compiled workflow, compiling it on the first call
+def get_app():
+    global _app
+    if _app is None:
+        _app = build_graph()
+    return _app
+
+# Pre-build everything the first request would otherwise pay for
+def warm_up() -> None:
+    from utils.sentiment import get_analyzer
+    get_app()
+    get_analyzer()
 
 # Function to run the workflow
 def run_workflow(symbol: str) -> StockState:
     initial_state = StockState(symbol=symbol, status="init", price=None, financials=None, sentiment=None)
     # Pass config with recursion_limit to invoke
-    final_state = app.invoke(initial_state, config={"recursion_limit": 100})
+    final_state = get_app().invoke(initial_state, config={"recursion_limit": 100})
     return final_state
 
 # Test the workflow
@@ -44,4 +63,3 @@ if __name__ == "__main__":
     end_time = time.time()
     print(f"Final State: {result}")
     print(f"Execution Time: {end_time - start_time:.2f} seconds")
-
@@ -0,0 +1,123 @@
+# Startup benchmark: measures how long it takes to import the backend, how long a
+# freshly started server takes to become ready (answer /health), and optionally how
+# long it then takes to answer a first real request such as /stock/AAPL. Exits with
+# status 1 if any number goes over its threshold, so it can be tracked in CI.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Regression thresholds in seconds. Tighten these as startup gets faster.
+MAX_IMPORT_SECONDS = 1.0
+MAX_READY_SECONDS = 5.0
+MAX_FIRST_REQUEST_SECONDS = 15.0
+
+READY_PATH = "/health"
+
+# Time a cold "import <module>" in a fresh interpreter and return the median in seconds
+def measure_import_time(module: str, runs: int) -> float:
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+# Start uvicorn and return the seconds until it answers /health. If request_path is
+# given, also return the seconds from launch until one request to it succeeds
+# (which runs the full workflow for /stock/{symbol}), otherwise None.
+def measure_startup_times(port: int, request_path: Optional[str], timeout: float) -> Tuple[float, Optional[float]]:
+    url = f"http://127.0.0.1:{port}{READY_PATH}"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited early with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        break
+            # URLError, refused connections and read timeouts (socket.timeout) are all OSErrors
+            except OSError:
+                pass
+            time.sleep(0.05)
+        else:
+            raise TimeoutError(f"No successful response from {url} within {timeout} seconds")
+        ready_seconds = time.perf_counter() - start
+
+        if request_path is None:
+            return ready_seconds, None
+        # A single request with the remaining time budget; a failure here is an error
+        remaining = max(timeout - ready_seconds, 1.0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{request_path}", timeout=remaining) as response:
+            if response.status != 200:
+                raise RuntimeError(f"{request_path} returned status {response.status}")
+        return ready_seconds, time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark backend cold start.")
+    parser.add_argument("--module", default="api.main", help="Module to time the import of")
+    parser.add_argument("--runs", type=int, default=5, help="Number of import timing runs")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmark server")
+    parser.add_argument("--request-path", help="Optional real request to time after startup, e.g. /stock/AAPL")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the server")
+    parser.add_argument("--max-import", type=float, default=MAX_IMPORT_SECONDS)
+    parser.add_argument("--max-ready", type=float, default=MAX_READY_SECONDS)
+    parser.add_argument("--max-first-request", type=float, default=MAX_FIRST_REQUEST_SECONDS)
+    parser.add_argument("--output", help="Optional JSON file to write the results to")
+    args = parser.parse_args()
+
+    ready_seconds, first_request_seconds = measure_startup_times(args.port, args.request_path, args.timeout)
+    results = {
+        "import_seconds": measure_import_time(args.module, args.runs),
+        "ready_seconds": ready_seconds,
+        "first_request_seconds": first_request_seconds,
+    }
+    print(f"Import time ({args.module}): {results['import_seconds']:.3f}s (max {args.max_import:.3f}s)")
+    print(f"Time to ready ({READY_PATH}): {ready_seconds:.3f}s (max {args.max_ready:.3f}s)")
+    if first_request_seconds is not None:
+        print(f"Time to first request ({args.request_path}): {first_request_seconds:.3f}s (max {args.max_first_request:.3f}s)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    if results["import_seconds"] > args.max_import:
+        print("REGRESSION: import time is over the threshold")
+        failed = True
+    if ready_seconds > args.max_ready:
+        print("REGRESSION: time to ready is over the threshold")
+        failed = True
+    if first_request_seconds is not None and first_request_seconds > args.max_first_request:
+        print("REGRESSION: time to first request is over the threshold")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
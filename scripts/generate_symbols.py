@@ -0,0 +1,44 @@
+# Build the NASDAQ symbol directory from data/nasdaqlisted.txt.
+# Writes data/nasdaq_symbols.json and data/nasdaq_symbols.bin, and reports the
+# symbols added and delisted since the previous build.
+import argparse
+import json
+import logging
+import os
+import sys
+
+# Make the project packages importable when run as `python scripts/generate_symbols.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.symbol_directory import BINARY_FILE, JSON_FILE, SOURCE_FILE, build_symbol_directory
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the NASDAQ symbol directory.")
+    parser.add_argument("--source", default=SOURCE_FILE, help="Pipe-delimited NASDAQ listing file")
+    parser.add_argument("--json", default=JSON_FILE, help="JSON output file")
+    parser.add_argument("--binary", default=BINARY_FILE, help="Binary (memory-mappable) output file")
+    parser.add_argument("--changes", help="Optional JSON file to write the added and delisted symbols to")
+    args = parser.parse_args()
+
+    try:
+        added, delisted = build_symbol_directory(args.source, args.json, args.binary)
+    except FileNotFoundError as e:
+        logger.error(f"Source file not found: {e.filename}")
+        return 1
+    except PermissionError:
+        logger.error(f"Could not replace {args.binary}. On Windows, stop the chatbot before rebuilding.")
+        return 1
+
+    logger.info(f"Added {len(added)} symbols: {', '.join(added) or 'none'}")
+    logger.info(f"Delisted {len(delisted)} symbols: {', '.join(delisted) or 'none'}")
+
+    if args.changes:
+        with open(args.changes, "w") as f:
+            json.dump({"added": added, "delisted": delisted}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
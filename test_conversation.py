@@ -0,0 +1,116 @@
+import os
+import sys
+
+# The Streamlit app imports its helpers relative to web/, so do the same here
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "web"))
+
+from conversation import ConversationContext, extract_symbol, detect_intent
+
+KNOWN_SYMBOLS = {"NVDA": "NVIDIA Corporation - Common Stock", "AAPL": "Apple Inc. - Common Stock"}
+
+# A fake clock so we can move time forward without sleeping.
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+# Pronouns and filler words shouldn't be mistaken for stock symbols.
+def test_extract_symbol_ignores_pronouns():
+    assert extract_symbol("and its financials?") is None
+    assert extract_symbol("what about the sentiment?") is None
+    assert extract_symbol("What's the price of NVDA?") == "NVDA"
+
+def test_detect_intent():
+    assert detect_intent("and its financials?") == "financials"
+    assert detect_intent("what about the sentiment?") == "sentiment"
+    assert detect_intent("is it a good buy?") == "analysis"
+    assert detect_intent("what's the weather?") == "invalid"
+
+# Follow-ups without a ticker should refer to the most recent symbol.
+def test_follow_up_resolves_to_last_symbol():
+    context = ConversationContext()
+    assert context.resolve_follow_up("and its financials?") == (None, None)
+
+    context.store_data("NVDA", {"price": 1.0})
+    assert context.resolve_follow_up("and its financials?") == ("NVDA", "financials")
+    assert context.resolve_follow_up("what about the sentiment?") == ("NVDA", "sentiment")
+
+# A new ticker or an unclear question goes through the normal parsing path.
+def test_follow_up_defers_on_new_symbol_or_invalid_intent():
+    context = ConversationContext()
+    context.store_data("NVDA", {"price": 1.0})
+    assert context.resolve_follow_up("and the price of AAPL?") == (None, None)
+    assert context.resolve_follow_up("how about aapl financials") == (None, None)
+    assert context.resolve_follow_up("so what is the price of aapl?") == (None, None)
+
+# Tickers and company names outside the directory still go through the normal parser.
+def test_follow_up_defers_on_unlisted_symbol_or_company_name():
+    context = ConversationContext()
+    context.store_data("AAPL", {"price": 1.0})
+    assert context.resolve_follow_up("What's the price of IBM?") == (None, None)
+    assert context.resolve_follow_up("price of APPL?") == (None, None)
+    assert context.resolve_follow_up("What about Tesla's price?") == (None, None)
+
+# Ordinary words that happen to be tickers (GOOD, ON, GO, HAS) don't block a follow-up.
+def test_follow_up_ignores_words_that_are_tickers():
+    context = ConversationContext()
+    context.store_data("AAPL", {"price": 1.0})
+    assert context.resolve_follow_up("is it a good buy?") == ("AAPL", "analysis")
+    assert context.resolve_follow_up("any news on it?") == ("AAPL", "sentiment")
+    assert context.resolve_follow_up("tell me a joke") == (None, None)
+
+# Stored data is reused until it gets stale.
+def test_data_expires_after_ttl():
+    clock = FakeClock()
+    context = ConversationContext(ttl_seconds=60, clock=clock)
+    context.store_data("NVDA", {"price": 1.0})
+
+    clock.now = 59
+    assert context.get_data("NVDA") == {"price": 1.0}
+    clock.now = 61
+    assert context.get_data("NVDA") is None
+
+# Reading stored data doesn't extend how long it stays fresh.
+def test_reading_data_does_not_extend_ttl():
+    clock = FakeClock()
+    context = ConversationContext(ttl_seconds=60, clock=clock)
+    context.store_data("NVDA", {"price": 1.0})
+
+    for now in (30, 50, 59):
+        clock.now = now
+        assert context.get_data("NVDA") == {"price": 1.0}
+    clock.now = 61
+    assert context.get_data("NVDA") is None
+
+# Only the most recently used symbols are kept.
+def test_data_is_bounded():
+    context = ConversationContext(max_symbols=2)
+    context.store_data("AAPL", {"price": 1.0})
+    context.store_data("NVDA", {"price": 2.0})
+    context.get_data("AAPL")
+    context.store_data("TSLA", {"price": 3.0})
+
+    assert context.get_data("NVDA") is None
+    assert context.get_data("AAPL") == {"price": 1.0}
+    assert context.last_symbol == "TSLA"
+
+def test_forget_drops_symbol():
+    context = ConversationContext()
+    context.store_data("NVDA", {"price": 1.0})
+    context.forget(["NVDA"])
+
+    assert context.get_data("NVDA") is None
+    assert context.last_symbol is None
+
+# After a symbol directory rebuild, only delisted symbols are dropped.
+def test_drop_delisted_keeps_listed_symbols():
+    context = ConversationContext()
+    context.store_data("AAPL", {"price": 1.0})
+    context.store_data("OLDCO", {"price": 2.0})
+    context.drop_delisted(KNOWN_SYMBOLS)
+
+    assert context.get_data("AAPL") == {"price": 1.0}
+    assert context.get_data("OLDCO") is None
+    assert context.last_symbol is None
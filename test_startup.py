@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+# Importing the workflow module should not pull in the heavy dependencies;
+# they are loaded on first use or by warm_up().
+def test_graph_import_is_lazy():
+    code = (
+        "import sys, graph; "
+        "heavy = [m for m in ('langgraph', 'vaderSentiment', 'dotenv') if m in sys.modules]; "
+        "print(','.join(heavy))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True, capture_output=True, text=True).stdout
+    assert output.strip() == ""
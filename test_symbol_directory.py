@@ -0,0 +1,108 @@
+import json
+import pytest
+from utils.symbol_directory import (
+    SymbolDirectory, build_symbol_directory, is_common_stock, iter_listings, load_previous_symbols,
+)
+
+HEADER = "Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares\n"
+TRAILER = "File Creation Time: 0622202521:32|||||||\n"
+
+# A small nasdaqlisted.txt with one of each kind of listing we need to filter.
+def write_listing(path, rows):
+    path.write_text(HEADER + "".join(row + "\n" for row in rows) + TRAILER)
+
+ROWS = [
+    "AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N",
+    "AACBW|Artius II Acquisition Inc. - Warrant|G|N|N|100|N|N",
+    "AACBU|Artius II Acquisition Inc. - Units|G|N|N|100|N|N",
+    "CTBI|Community Trust Bancorp, Inc. - Common Stock|Q|N|N|100|N|N",
+    "AGNCP|AGNC Investment Corp. - Depositary Shares of 6.125% Series F Preferred Stock|Q|N|N|100|N|N",
+    "QQQ|Invesco QQQ Trust, Series 1|G|N|N|100|Y|N",
+    "ZXZZT|NASDAQ TEST STOCK - Common Stock|G|Y|N|100|N|N",
+    "DEFC|Deficient Corp. - Common Stock|S|N|D|100|N|N",
+]
+
+def test_is_common_stock():
+    assert is_common_stock("Apple Inc. - Common Stock")
+    assert is_common_stock("United Airlines Holdings, Inc. - Common Stock")
+    assert not is_common_stock("Aeva Technologies, Inc. - Redeemable Warrants")
+    assert not is_common_stock("CHS Inc - Class B Cumulative Redeemable Preferred Stock")
+    assert not is_common_stock("Fifth Third Bancorp - Depositary Share repstg 1/1000th Ownership Interest Perp Pfd Series I")
+    assert not is_common_stock("WaFd, Inc. - Depositary Shares")
+    assert not is_common_stock("Cadiz, Inc. - Depositary Shares")
+    assert not is_common_stock("MainStreet Bancshares, Inc. - Depositary Shares")
+    assert is_common_stock("Melco Resorts & Entertainment Limited - American Depositary Shares")
+
+# Only common stock in normal standing should come through.
+def test_iter_listings_filters(tmp_path):
+    source = tmp_path / "nasdaqlisted.txt"
+    write_listing(source, ROWS)
+
+    assert dict(iter_listings(str(source))) == {
+        "AAPL": "Apple Inc. - Common Stock",
+        "CTBI": "Community Trust Bancorp, Inc. - Common Stock",
+    }
+
+# A rebuild reports the symbols added and delisted since the last build.
+def test_build_reports_changes_and_writes_both_formats(tmp_path):
+    source = tmp_path / "nasdaqlisted.txt"
+    json_path = tmp_path / "nasdaq_symbols.json"
+    binary_path = tmp_path / "nasdaq_symbols.bin"
+
+    write_listing(source, ROWS)
+    added, delisted = build_symbol_directory(str(source), str(json_path), str(binary_path))
+    assert added == ["AAPL", "CTBI"]
+    assert delisted == []
+
+    write_listing(source, [ROWS[0], "NVDA|NVIDIA Corporation - Common Stock|Q|N|N|100|N|N"])
+    added, delisted = build_symbol_directory(str(source), str(json_path), str(binary_path))
+    assert added == ["NVDA"]
+    assert delisted == ["CTBI"]
+
+    records = json.loads(json_path.read_text())
+    assert records == [
+        {"symbol": "AAPL", "company_name": "Apple Inc. - Common Stock"},
+        {"symbol": "NVDA", "company_name": "NVIDIA Corporation - Common Stock"},
+    ]
+
+    directory = SymbolDirectory(str(binary_path))
+    assert len(directory) == 2
+    assert list(directory) == ["AAPL", "NVDA"]
+    assert "NVDA" in directory
+    assert "CTBI" not in directory
+    assert directory["AAPL"] == "Apple Inc. - Common Stock"
+    assert directory.get("MSFT") is None
+    directory.close()
+
+# A symbol that doesn't fit the binary format must not leave the outputs out of sync.
+def test_build_writes_nothing_when_a_symbol_is_too_long(tmp_path):
+    source = tmp_path / "nasdaqlisted.txt"
+    json_path = tmp_path / "nasdaq_symbols.json"
+    binary_path = tmp_path / "nasdaq_symbols.bin"
+
+    write_listing(source, [ROWS[0]])
+    build_symbol_directory(str(source), str(json_path), str(binary_path))
+    json_before = json_path.read_bytes()
+    binary_before = binary_path.read_bytes()
+
+    write_listing(source, [ROWS[0], "TOOLONGSYM|Too Long Inc. - Common Stock|Q|N|N|100|N|N"])
+    with pytest.raises(ValueError):
+        build_symbol_directory(str(source), str(json_path), str(binary_path))
+
+    assert json_path.read_bytes() == json_before
+    assert binary_path.read_bytes() == binary_before
+
+# A truncated binary file is rejected, and the previous build falls back to the JSON.
+def test_truncated_binary_falls_back_to_json(tmp_path):
+    source = tmp_path / "nasdaqlisted.txt"
+    json_path = tmp_path / "nasdaq_symbols.json"
+    binary_path = tmp_path / "nasdaq_symbols.bin"
+    write_listing(source, ROWS)
+    build_symbol_directory(str(source), str(json_path), str(binary_path))
+    full = binary_path.read_bytes()
+
+    for size in (4, len(full) - 1):
+        binary_path.write_bytes(full[:size])
+        with pytest.raises(ValueError):
+            SymbolDirectory(str(binary_path))
+        assert load_previous_symbols(str(binary_path), str(json_path)) == {"AAPL", "CTBI"}
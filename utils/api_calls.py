@@ -1,14 +1,20 @@
 import requests
-from dotenv import load_dotenv
 import os
+from typing import Optional
 
-load_dotenv()
+# The .env file is read the first time a key is needed rather than at import time
+_env_loaded = False
 
-ALPHA_VANTAGE_KEY = os.getenv("ALPHA_VANTAGE_KEY")
-NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
+def get_api_key(name: str) -> Optional[str]:
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    return os.getenv(name)
 
 def get_stock_price(symbol: str) -> float:
-    url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={ALPHA_VANTAGE_KEY}"
+    url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={get_api_key('ALPHA_VANTAGE_KEY')}"
     response = requests.get(url)
     data = response.json()
     if "Global Quote" in data and "05. price" in data["Global Quote"]:
@@ -17,7 +23,7 @@ def get_stock_price(symbol: str) -> float:
         raise ValueError(f"Unable to fetch stock price for {symbol}")
 
 def get_financial_metrics(symbol: str) -> dict:
-    url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={symbol}&apikey={ALPHA_VANTAGE_KEY}"
+    url = f"https://www.alphavantage.co/query?function=OVERVIEW&symbol={symbol}&apikey={get_api_key('ALPHA_VANTAGE_KEY')}"
     response = requests.get(url)
     data = response.json()
     if "MarketCapitalization" in data and "RevenueTTM" in data and "EBITDA" in data:
@@ -41,7 +47,7 @@ def get_news_articles(symbol: str, max_articles: int = 5) -> list:
     url = "https://newsapi.org/v2/everything"
     params = {
         "q": query,
-        "apiKey": NEWSAPI_KEY,
+        "apiKey": get_api_key("NEWSAPI_KEY"),
         "language": "en",
         "sortBy": "publishedAt",
         "pageSize": max_articles
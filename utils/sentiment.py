@@ -1,7 +1,16 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+# The VADER analyzer loads its lexicon from disk when constructed, so we build it
+# once on first use instead of at import time or on every call.
+_analyzer = None
+
+def get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
 
 def analyze_sentiment(articles: list) -> dict:
-    analyzer = SentimentIntensityAnalyzer()
+    analyzer = get_analyzer()
     sentiments = []
     for article in articles:
         text = article["title"] + " " + article["description"]
@@ -0,0 +1,221 @@
+# NASDAQ symbol directory: builds the list of common stocks from NASDAQ's pipe-delimited
+# nasdaqlisted.txt and stores it both as JSON (for compatibility) and as a compact
+# binary file that can be memory-mapped, so lookups don't need to parse the whole list.
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FILE = "data/nasdaqlisted.txt"
+JSON_FILE = "data/nasdaq_symbols.json"
+BINARY_FILE = "data/nasdaq_symbols.bin"
+
+# Binary layout (little-endian), with every column stored contiguously:
+#   header:       magic, format version, symbol count, size of the names blob
+#   symbols:      count fixed-width ASCII symbols, NUL-padded, sorted
+#   name offsets: count + 1 offsets into the names blob
+#   names:        UTF-8 company names, concatenated
+MAGIC = b"NSYM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHxxII")
+SYMBOL_WIDTH = 8
+OFFSET = struct.Struct("<I")
+
+# Security classes that aren't common stock, matched against the part of the
+# security name after the company name (e.g. "Apple Inc. - Common Stock").
+# Plain "Depositary Shares" are interests in preferred stock; American Depositary
+# Shares (ADS) represent foreign common shares and are kept.
+NON_COMMON_PATTERN = re.compile(
+    r"\b(warrants?|rights?|units?|preferred|preference|pfd|notes?|debentures?|etf"
+    r"|(?<!american )depositary shares?)\b",
+    re.IGNORECASE,
+)
+
+# Return True if the security name describes common stock (or ordinary shares/ADS)
+def is_common_stock(security_name: str) -> bool:
+    _, _, security_class = security_name.partition(" - ")
+    return not NON_COMMON_PATTERN.search(security_class or security_name)
+
+# Stream (symbol, company_name) pairs for the common stocks in a nasdaqlisted.txt file,
+# skipping ETFs, NextShares, test issues and companies not in normal financial status
+def iter_listings(path: str = SOURCE_FILE) -> Iterator[Tuple[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        columns = {name: i for i, name in enumerate(f.readline().rstrip("\r\n").split("|"))}
+        symbol_col = columns["Symbol"]
+        name_col = columns["Security Name"]
+        test_col = columns["Test Issue"]
+        status_col = columns["Financial Status"]
+        etf_col = columns["ETF"]
+        nextshares_col = columns.get("NextShares")
+
+        for line in f:
+            # The file ends with a "File Creation Time: ..." trailer line
+            if line.startswith("File Creation Time"):
+                break
+            fields = line.rstrip("\r\n").split("|")
+            if len(fields) < len(columns):
+                continue
+            if fields[etf_col] == "Y" or fields[test_col] == "Y" or fields[status_col] != "N":
+                continue
+            if nextshares_col is not None and fields[nextshares_col] == "Y":
+                continue
+            name = fields[name_col].strip()
+            if is_common_stock(name):
+                yield fields[symbol_col], name
+
+class SymbolDirectory:
+    # Read-only, memory-mapped view of a binary symbol directory. Supports the
+    # dict-style lookups consumers need: `symbol in directory`, `directory[symbol]`
+    # and `directory.get(symbol)`, each a binary search over the mapped file.
+    def __init__(self, path: str = BINARY_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            self._mm.close()
+            raise ValueError(f"{path} is too short to be a symbol directory")
+        magic, version, self._count, names_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} symbol directory")
+        self._symbols_start = HEADER.size
+        self._offsets_start = self._symbols_start + self._count * SYMBOL_WIDTH
+        self._names_start = self._offsets_start + (self._count + 1) * OFFSET.size
+        if self._names_start + names_size != len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._symbol_at(i).decode("ascii")
+
+    def __contains__(self, symbol) -> bool:
+        return isinstance(symbol, str) and self._index(symbol) is not None
+
+    def __getitem__(self, symbol: str) -> str:
+        name = self.get(symbol)
+        if name is None:
+            raise KeyError(symbol)
+        return name
+
+    def get(self, symbol: str, default: Optional[str] = None) -> Optional[str]:
+        i = self._index(symbol)
+        if i is None:
+            return default
+        start = OFFSET.unpack_from(self._mm, self._offsets_start + i * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self._mm, self._offsets_start + (i + 1) * OFFSET.size)[0]
+        return self._mm[self._names_start + start:self._names_start + end].decode("utf-8")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _symbol_at(self, i: int) -> bytes:
+        start = self._symbols_start + i * SYMBOL_WIDTH
+        return self._mm[start:start + SYMBOL_WIDTH].rstrip(b"\0")
+
+    def _index(self, symbol: str) -> Optional[int]:
+        try:
+            key = symbol.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._symbol_at(mid)
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+# Raise ValueError if any symbol can't be stored in the binary format
+def validate_symbols(symbols: Dict[str, str]) -> None:
+    for symbol in symbols:
+        try:
+            encoded = symbol.encode("ascii")
+        except UnicodeEncodeError:
+            raise ValueError(f"Symbol {symbol} is not ASCII")
+        if len(encoded) > SYMBOL_WIDTH:
+            raise ValueError(f"Symbol {symbol} is longer than {SYMBOL_WIDTH} characters")
+
+# Write the directory to the binary format. The file is written next to the target
+# and renamed into place, so readers that still have the old file mapped aren't affected.
+# Windows doesn't allow replacing a file another process has mapped, so there this
+# raises PermissionError while the chatbot is running.
+def write_binary(symbols: Dict[str, str], path: str = BINARY_FILE) -> None:
+    validate_symbols(symbols)
+    ordered = sorted(symbols)
+    names = bytearray()
+    offsets = [0]
+    for symbol in ordered:
+        names += symbols[symbol].encode("utf-8")
+        offsets.append(len(names))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(ordered), len(names)))
+        for symbol in ordered:
+            f.write(symbol.encode("ascii").ljust(SYMBOL_WIDTH, b"\0"))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        f.write(names)
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        os.remove(tmp_path)
+        raise
+
+# Write the directory as the JSON list of {"symbol", "company_name"} records
+def write_json(symbols: Dict[str, str], path: str = JSON_FILE) -> None:
+    records = [{"symbol": symbol, "company_name": symbols[symbol]} for symbol in sorted(symbols)]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    os.replace(tmp_path, path)
+
+# Return the symbols of the previous build, from the binary file if there is one,
+# otherwise from the JSON file, otherwise an empty set
+def load_previous_symbols(binary_path: str = BINARY_FILE, json_path: str = JSON_FILE) -> set:
+    if os.path.exists(binary_path):
+        try:
+            directory = SymbolDirectory(binary_path)
+        except ValueError as e:
+            logger.warning(f"Ignoring previous binary build: {e}")
+        else:
+            try:
+                return set(directory)
+            finally:
+                directory.close()
+    if os.path.exists(json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            return {item["symbol"] for item in json.load(f)}
+    return set()
+
+# Build the directory from source and write both outputs. Returns the lists of
+# symbols added and delisted since the previous build.
+def build_symbol_directory(source_path: str = SOURCE_FILE, json_path: str = JSON_FILE,
+                           binary_path: str = BINARY_FILE) -> Tuple[List[str], List[str]]:
+    previous = load_previous_symbols(binary_path, json_path)
+    symbols = dict(iter_listings(source_path))
+    logger.info(f"Filtered to {len(symbols)} valid NASDAQ stock symbols from {source_path}")
+
+    added = sorted(set(symbols) - previous)
+    delisted = sorted(previous - set(symbols))
+
+    # Check before writing anything, and write the binary first since replacing it is
+    # the step that can fail (see write_binary), so the two outputs never disagree
+    validate_symbols(symbols)
+    write_binary(symbols, binary_path)
+    write_json(symbols, json_path)
+    logger.info(f"Saved {len(symbols)} records to {json_path} and {binary_path}")
+    return added, delisted
@@ -2,10 +2,16 @@ import streamlit as st
 import requests
 import re
 import os
-import json
+import sys
+import threading
+from collections import deque
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
 import logging
+from conversation import ConversationContext, extract_symbol, detect_intent
+
+# Make the project packages importable when run as `streamlit run web/app.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.symbol_directory import BINARY_FILE, SymbolDirectory
 
 # Set up logging to both file and console for debugging
 logging.basicConfig(
@@ -22,57 +28,60 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 HUGGINGFACE_API_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN")
 
-# Initialize the Hugging Face client for AI responses
 if not HUGGINGFACE_API_TOKEN:
     logger.error("Hugging Face API token not found in .env")
     st.error("Hugging Face API token not found in .env")
     st.stop()
-client = InferenceClient(token=HUGGINGFACE_API_TOKEN)
 
-# Load NASDAQ stock symbols and company names from JSON file
-SYMBOLS_FILE = "data/nasdaq_symbols.json"
-try:
-    with open(SYMBOLS_FILE, "r") as f:
-        nasdaq_data = json.load(f)
-        NASDAQ_SYMBOLS = {item["symbol"]: item["company_name"] for item in nasdaq_data}
-    logger.info(f"Loaded {len(NASDAQ_SYMBOLS)} NASDAQ symbols from {SYMBOLS_FILE}")
-except FileNotFoundError:
-    logger.error(f"Symbols file {SYMBOLS_FILE} not found")
-    st.error("NASDAQ symbols file not found. Please run scripts/generate_symbols.py.")
-    st.stop()
-except Exception as e:
-    logger.error(f"Failed to load symbols: {str(e)}")
-    st.error("Error loading NASDAQ symbols. Contact support.")
-    st.stop()
+# Initialize the Hugging Face client for AI responses on first use, once per server process
+@st.cache_resource
+def get_client():
+    from huggingface_hub import InferenceClient
+    return InferenceClient(token=HUGGINGFACE_API_TOKEN)
 
-# Set up the main chat interface
-st.title("Stock Chatbot")
+# Open the memory-mapped NASDAQ symbol directory, shared by all sessions. It is reopened
+# when the file's build (its modification time) changes, so a rebuild is picked up
+# without a restart, and the previous mapping is closed.
+SYMBOLS_FILE = BINARY_FILE
 
-# Initialize chat history with a welcome message
-if "messages" not in st.session_state:
-    st.session_state.messages = [
-        {"role": "assistant", "content": "Hi! I'm your Stock Chatbot. Ask me about any NASDAQ stock, like 'What's the price of AAPL?' or 'Is TSLA a good buy?'."}
-    ]
+@st.cache_resource
+def get_symbols_holder() -> dict:
+    return {"build_id": None, "directory": None, "lock": threading.Lock()}
 
-# Display all previous chat messages
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        st.markdown(message["content"])
+def load_nasdaq_symbols(build_id: int) -> SymbolDirectory:
+    holder = get_symbols_holder()
+    with holder["lock"]:
+        if holder["build_id"] != build_id:
+            symbols = SymbolDirectory(SYMBOLS_FILE)
+            if holder["directory"] is not None:
+                holder["directory"].close()
+            holder["build_id"] = build_id
+            holder["directory"] = symbols
+            logger.info(f"Loaded {len(symbols)} NASDAQ symbols from {SYMBOLS_FILE}")
+        return holder["directory"]
 
-# Handle new user input
-if prompt := st.chat_input("Type your question (e.g., 'Price of AAPL')"):
-    # Add user message to chat history
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-
-    # Set default error response
-    response = "Sorry, something went wrong. Please try again."
-    logger.debug(f"Processing query: {prompt}")
+def get_nasdaq_symbols() -> SymbolDirectory:
+    try:
+        build_id = os.stat(SYMBOLS_FILE).st_mtime_ns
+        symbols = load_nasdaq_symbols(build_id)
+    except FileNotFoundError:
+        logger.error(f"Symbols file {SYMBOLS_FILE} not found")
+        st.error("NASDAQ symbols file not found. Please run scripts/generate_symbols.py.")
+        st.stop()
+    except Exception as e:
+        logger.error(f"Failed to load symbols: {str(e)}")
+        st.error("Error loading NASDAQ symbols. Contact support.")
+        st.stop()
 
-    # Define common words to filter out when looking for stock symbols
-    COMMON_WORDS = {"WHAT", "IS", "THE", "PRICE", "OF", "FOR", "IN", "A", "AN", "AND", "GIVE", "ME", "LATEST", "STOCK", "VALUE", "LATEST"}
+    # After a rebuild, only the data remembered for delisted symbols is dropped
+    if st.session_state.get("symbols_build_id") != build_id:
+        if "context" in st.session_state:
+            st.session_state.context.drop_delisted(symbols)
+        st.session_state.symbols_build_id = build_id
+    return symbols
 
+# Extract the stock symbol and intent from a query, using AI first and regex as a fallback
+def parse_query(client, prompt: str):
     # Primary approach: Use AI to extract stock symbol and intent together
     logger.debug("Using AI for symbol and intent extraction")
     try:
@@ -131,60 +140,65 @@ Response:"""
         # Fallback: Improved regex-based extraction
         logger.debug("Using improved regex fallback")
         
-        # Better regex patterns for symbol extraction
-        symbol_patterns = [
-            r'\b(?:of|for|price|value|stock)\s+([A-Z]{1,5})\b',
-            r'\b([A-Z]{1,5})\s+(?:price|stock|financials|analysis)\b',
-            r'\b([A-Z]{1,5})\b(?=\s+(?:is|are|has|have|shows?|display))',
-        ]
-        
-        symbol = None
-        for pattern in symbol_patterns:
-            match = re.search(pattern, prompt.upper())
-            if match:
-                candidate = match.group(1)
-                if candidate not in COMMON_WORDS:
-                    symbol = candidate
-                    logger.debug(f"Regex extracted symbol: {symbol}")
-                    break
-        
-        # If still no symbol, look for any 1-5 letter uppercase words that aren't common
-        if not symbol:
-            words = re.findall(r'\b[A-Z]{1,5}\b', prompt.upper())
-            symbol_candidates = [w for w in words if w not in COMMON_WORDS]
-            if symbol_candidates:
-                symbol = symbol_candidates[0]
-                logger.debug(f"Regex fallback extracted symbol: {symbol}")
-        
-        # Intent detection with improved patterns
-        query_lower = prompt.lower()
-        price_patterns = [
-            r'\bprice\b', r'\bstock\s*value\b', r'\bhow\s*much\s*is\b', 
-            r'\bcurrent\s*price\b', r'\blatest\s*price\b', r'\bgive\s*me\s*\w*\s*price\b'
-        ]
-        financials_patterns = [r'\bfinancials?\b', r'\bmarket\s*cap\b', r'\brevenue\b', r'\bearnings\b']
-        sentiment_patterns = [r'\bsentiment\b', r'\bnews\b', r'\bmarket\s*mood\b']
-        analysis_patterns = [r'\banalysis\b', r'\bmarket\s*analysis\b', r'\bgood\s*(buy|investment)\b', r'\bis\s*\w*\s*a\s*good\b']
-        
-        if any(re.search(pattern, query_lower) for pattern in price_patterns):
-            intent = "price"
-        elif any(re.search(pattern, query_lower) for pattern in financials_patterns):
-            intent = "financials"
-        elif any(re.search(pattern, query_lower) for pattern in sentiment_patterns):
-            intent = "sentiment"
-        elif any(re.search(pattern, query_lower) for pattern in analysis_patterns):
-            intent = "analysis"
-        else:
-            intent = "invalid"
-        
+        symbol = extract_symbol(prompt)
+        intent = detect_intent(prompt)
         logger.debug(f"Regex fallback - symbol: {symbol}, intent: {intent}")
+    return symbol, intent
+
+# Set up the main chat interface
+st.title("Stock Chatbot")
+
+# Only the most recent messages are kept, so long sessions don't slow down rendering
+MAX_MESSAGES = 50
+
+# Initialize chat history with a welcome message
+if "messages" not in st.session_state:
+    st.session_state.messages = deque([
+        {"role": "assistant", "content": "Hi! I'm your Stock Chatbot. Ask me about any NASDAQ stock, like 'What's the price of AAPL?' or 'Is TSLA a good buy?'."}
+    ], maxlen=MAX_MESSAGES)
+
+# Initialize the conversation context used to answer follow-up questions
+if "context" not in st.session_state:
+    st.session_state.context = ConversationContext()
+
+# Display all previous chat messages
+for message in st.session_state.messages:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+# Handle new user input
+if prompt := st.chat_input("Type your question (e.g., 'Price of AAPL')"):
+    # Add user message to chat history
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    # Set default error response
+    response = "Sorry, something went wrong. Please try again."
+    client = get_client()
+    logger.debug(f"Processing query: {prompt}")
+
+    context = st.session_state.context
+
+    # Follow-ups about the most recent symbol are resolved locally, without the AI round-trip
+    symbol, intent = context.resolve_follow_up(prompt)
+    if symbol:
+        logger.debug(f"Resolved follow-up locally - symbol: {symbol}, intent: {intent}")
+    else:
+        symbol, intent = parse_query(client, prompt)
+        # Pronouns and omitted tickers refer to the most recent symbol in the conversation
+        if not symbol and context.last_symbol:
+            symbol = context.last_symbol
+            logger.debug(f"No symbol in query, using most recent symbol: {symbol}")
 
     # Check if the extracted symbol is valid and get the company name
     company_name = None
     if symbol:
-        if symbol in NASDAQ_SYMBOLS:
-            company_name = NASDAQ_SYMBOLS[symbol]
+        nasdaq_symbols = get_nasdaq_symbols()
+        if symbol in nasdaq_symbols:
+            company_name = nasdaq_symbols[symbol]
             logger.debug(f"Valid NASDAQ symbol: {symbol}, company name: {company_name}")
+            context.last_symbol = symbol
         else:
             response = f"Sorry, '{symbol}' isn't a valid NASDAQ stock symbol. Try a NASDAQ-listed stock like AAPL or TSLA."
             logger.info(f"Invalid NASDAQ symbol: {symbol}")
@@ -200,16 +214,22 @@ Response:"""
             logger.info(f"Invalid intent for query: {prompt}")
         else:
             try:
-                # Get stock data from our FastAPI backend
-                logger.debug(f"Sending API request for {symbol}, company_name: {company_name}")
-                api_response = requests.get(
-                    f"http://localhost:8000/stock/{symbol}",
-                    params={"companyName": company_name},
-                    timeout=10
-                )
-                api_response.raise_for_status()
-                data = api_response.json()
-                logger.debug(f"API response: {data}")
+                # Reuse data fetched earlier in this conversation while it is still fresh
+                data = context.get_data(symbol)
+                from_cache = data is not None
+                if from_cache:
+                    logger.debug(f"Using cached data for {symbol}")
+                else:
+                    # Get stock data from our FastAPI backend
+                    logger.debug(f"Sending API request for {symbol}, company_name: {company_name}")
+                    api_response = requests.get(
+                        f"http://localhost:8000/stock/{symbol}",
+                        params={"companyName": company_name},
+                        timeout=10
+                    )
+                    api_response.raise_for_status()
+                    data = api_response.json()
+                    logger.debug(f"API response: {data}")
 
                 # Make sure we got all the data we need
                 required_fields = {"price", "financials", "sentiment", "status"}
@@ -217,6 +237,9 @@ Response:"""
                     logger.error(f"Invalid API response for {symbol}: {data}")
                     response = f"I received incomplete data for {symbol}. Please try again."
                 else:
+                    # Only freshly fetched data starts a new freshness window
+                    if not from_cache:
+                        context.store_data(symbol, data)
                     # Use AI to create natural, conversational responses
                     try:
                         if intent == "price":
@@ -0,0 +1,131 @@
+# Per-session conversation state for the Streamlit chatbot: remembers the most recent
+# symbol so follow-ups like "and its financials?" work, and keeps recently fetched
+# stock data so those follow-ups are answered without another backend call.
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Tuple
+
+# How long fetched stock data is reused for follow-up questions, in seconds
+DATA_TTL_SECONDS = 300
+
+# How many symbols' data a single session keeps around
+MAX_CACHED_SYMBOLS = 20
+
+# Common words to filter out when looking for stock symbols
+COMMON_WORDS = {"WHAT", "IS", "THE", "PRICE", "OF", "FOR", "IN", "A", "AN", "AND", "GIVE", "ME", "LATEST", "STOCK", "VALUE"}
+
+# Pronouns and filler words used in follow-up questions, which also must not be read as symbols
+FOLLOW_UP_WORDS = {"IT", "ITS", "IT'S", "THEY", "THEIR", "THEM", "THAT", "THIS", "SAME", "ABOUT", "HOW", "ALSO", "TOO", "NOW", "THEN"}
+
+IGNORED_WORDS = COMMON_WORDS | FOLLOW_UP_WORDS
+
+# Regex patterns for symbol extraction
+SYMBOL_PATTERNS = [
+    r'\b(?:of|for|price|value|stock)\s+([A-Z]{1,5})\b',
+    r'\b([A-Z]{1,5})\s+(?:price|stock|financials|analysis)\b',
+    r'\b([A-Z]{1,5})\b(?=\s+(?:is|are|has|have|shows?|display))',
+]
+
+# Regex patterns for intent detection, checked in this order
+INTENT_PATTERNS = [
+    ("price", [
+        r'\bprice\b', r'\bstock\s*value\b', r'\bhow\s*much\s*is\b',
+        r'\bcurrent\s*price\b', r'\blatest\s*price\b', r'\bgive\s*me\s*\w*\s*price\b'
+    ]),
+    ("financials", [r'\bfinancials?\b', r'\bmarket\s*cap\b', r'\brevenue\b', r'\bearnings\b']),
+    ("sentiment", [r'\bsentiment\b', r'\bnews\b', r'\bmarket\s*mood\b']),
+    ("analysis", [r'\banalysis\b', r'\bmarket\s*analysis\b', r'\bgood\s*(buy|investment)\b', r'\bis\s*\w*\s*a\s*good\b']),
+]
+
+# Yield the words in symbol positions of the query ("price of X", "X stock", ...), in any letter case
+def iter_pattern_symbols(prompt: str) -> Iterator[str]:
+    text = prompt.upper()
+    for pattern in SYMBOL_PATTERNS:
+        # Matches may overlap ("PRICE OF NVDA"), so resume the search just after each match start
+        regex = re.compile(pattern, re.IGNORECASE)
+        pos = 0
+        while match := regex.search(text, pos):
+            if match.group(1) not in IGNORED_WORDS:
+                yield match.group(1)
+            pos = match.start() + 1
+
+# Yield possible stock symbols in the query, most likely first, in any letter case
+def iter_symbol_candidates(prompt: str) -> Iterator[str]:
+    yield from iter_pattern_symbols(prompt)
+
+    # Then any 1-5 letter words that aren't common
+    for word in re.findall(r'\b[A-Z]{1,5}\b', prompt.upper()):
+        if word not in IGNORED_WORDS:
+            yield word
+
+# Extract a stock symbol from the query with regex, or None if there isn't one
+def extract_symbol(prompt: str) -> Optional[str]:
+    return next(iter_symbol_candidates(prompt), None)
+
+# Detect the intent of the query with regex: price, financials, sentiment, analysis or invalid
+def detect_intent(prompt: str) -> str:
+    query_lower = prompt.lower()
+    for intent, patterns in INTENT_PATTERNS:
+        if any(re.search(pattern, query_lower) for pattern in patterns):
+            return intent
+    return "invalid"
+
+class ConversationContext:
+    def __init__(self, ttl_seconds: float = DATA_TTL_SECONDS, max_symbols: int = MAX_CACHED_SYMBOLS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_symbols = max_symbols
+        self.clock = clock
+        self.last_symbol: Optional[str] = None
+        # symbol -> (fetched_at, data), least recently used first
+        self._data: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    # Answer (symbol, intent) for a follow-up about the most recent symbol, using only
+    # local regex parsing. Returns (None, None) when the query names a symbol or company
+    # of its own ("price of IBM", "Tesla's price"), listed or not, or has no recognizable
+    # intent; those go through the normal parser. Other words aren't checked against the
+    # directory, since ordinary words like GOOD or ON are listed tickers.
+    def resolve_follow_up(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        if self.last_symbol is None:
+            return None, None
+        if any(candidate != self.last_symbol for candidate in iter_pattern_symbols(prompt)):
+            return None, None
+        intent = detect_intent(prompt)
+        if intent == "invalid":
+            return None, None
+        return self.last_symbol, intent
+
+    # Return the stored data for symbol if it is still fresh, otherwise None
+    def get_data(self, symbol: str) -> Optional[dict]:
+        entry = self._data.get(symbol)
+        if entry is None:
+            return None
+        fetched_at, data = entry
+        if self.clock() - fetched_at > self.ttl_seconds:
+            del self._data[symbol]
+            return None
+        self._data.move_to_end(symbol)
+        return data
+
+    # Remember freshly fetched data for symbol and make it the current symbol
+    def store_data(self, symbol: str, data: dict) -> None:
+        self._data[symbol] = (self.clock(), data)
+        self._data.move_to_end(symbol)
+        while len(self._data) > self.max_symbols:
+            self._data.popitem(last=False)
+        self.last_symbol = symbol
+
+    # Drop everything remembered about the given symbols
+    def forget(self, symbols) -> None:
+        for symbol in symbols:
+            self._data.pop(symbol, None)
+            if self.last_symbol == symbol:
+                self.last_symbol = None
+
+    # Drop everything remembered about symbols that are no longer in known_symbols
+    def drop_delisted(self, known_symbols) -> None:
+        remembered = set(self._data)
+        if self.last_symbol is not None:
+            remembered.add(self.last_symbol)
+        self.forget([symbol for symbol in remembered if symbol not in known_symbols])